@@ -1,29 +1,19 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Final, FrozenSet, List, Optional, Dict, Any
 from pathlib import Path
+import threading
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import os
 import sys
 
-@dataclass
-class Config:
-    DOWNLOADS_DIR: Path = Path("downloads")
-    REPORTS_DIR: Path = field(default_factory=lambda: Path("downloads/reports"))
-    ATTACHMENTS_DIR: Path = field(default_factory=lambda: Path("downloads/attachments"))
-    ALLOWED_CONTENT_TYPES: List[str] = field(default_factory=lambda: ["text/markdown", "text/x-diff"])
-    BASE_URL: str = "https://hackerone.com"
-    RATE_LIMIT_DELAY: int = 1  # seconds between requests
-    CURRENCY_MAP: Dict[str, str] = field(default_factory=lambda: {
-        "USD": "$",
-        "EUR": "€",
-        "GBP": "£",
-        "JPY": "¥",
-        "AUD": "A$",
-        "CAD": "C$",
-        "CHF": "CHF",
-    })
-    QUERY: str = """
+# The GraphQL search query, split around the page size so building it is a plain concatenation
+_QUERY_PREFIX: Final[str] = """
     query {
       me {
         id
@@ -33,7 +23,8 @@ class Config:
         index: CompleteHacktivityReportIndex
         query_string: "disclosed:true"
         from: 0
-        size: %d
+        size: """
+_QUERY_SUFFIX: Final[str] = """
         sort: { field: "latest_disclosable_activity_at", direction: DESC }
       ) {
         __typename
@@ -125,59 +116,124 @@ class Config:
     }
     """
 
+@dataclass
+class Config:
+    DOWNLOADS_DIR: Path = Path("downloads")  # kept for compatibility; REPORTS_DIR/ATTACHMENTS_DIR decide where files go
+    REPORTS_DIR: Path = field(default_factory=lambda: Path("downloads/reports"))
+    ATTACHMENTS_DIR: Path = field(default_factory=lambda: Path("downloads/attachments"))
+    ALLOWED_CONTENT_TYPES: FrozenSet[str] = field(default_factory=lambda: frozenset({"text/markdown", "text/x-diff"}))
+    BASE_URL: str = "https://hackerone.com"
+    RATE_LIMIT_DELAY: int = 1  # seconds between requests
+    ATTACHMENT_WORKERS: int = 8  # concurrent attachment downloads
+    REPORT_WORKERS: int = 16  # reports processed concurrently
+    WRITE_BUFFER_SIZE: int = 1 << 20  # bytes buffered per file write
+    DOWNLOAD_CHUNK_SIZE: int = 256 * 1024  # bytes read per streamed chunk
+    CURRENCY_MAP: Dict[str, str] = field(default_factory=lambda: {
+        "USD": "$",
+        "EUR": "€",
+        "GBP": "£",
+        "JPY": "¥",
+        "AUD": "A$",
+        "CAD": "C$",
+        "CHF": "CHF",
+    })
+
+def _ensure_dirs(reports_dir: Path, attachments_dir: Path) -> None:
+    # parents=True also creates the shared downloads/ parent
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    attachments_dir.mkdir(parents=True, exist_ok=True)
+
 class HackerOneAPI:
     def __init__(self, config: Config):
         self.config = config
-        self.headers = {'Content-Type': 'application/json'}
-        self._ensure_directories()
+        self.session = self._create_session(config)
+        self._last_request_ts = float('-inf')
+        self._rate_limit_lock = threading.Lock()
+        self._payload_cache: Dict[int, bytes] = {}
+        _ensure_dirs(self.config.REPORTS_DIR, self.config.ATTACHMENTS_DIR)
+        # Scan once instead of stat-ing every report file
+        self._existing_reports = {p.stem for p in self.config.REPORTS_DIR.iterdir() if p.suffix == '.md'}
+
+    @staticmethod
+    def _create_session(config: Config) -> requests.Session:
+        # Reuse pooled keep-alive connections across all reports and attachments
+        session = requests.Session()
+        session.headers.update({'Content-Type': 'application/json'})
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        # One connection per worker thread, so pool_block never has to wait
+        pool_size = config.REPORT_WORKERS + config.ATTACHMENT_WORKERS
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_size, max_retries=retry, pool_block=True)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
     
-    def _ensure_directories(self) -> None:
-        for directory in [self.config.DOWNLOADS_DIR, self.config.REPORTS_DIR, self.config.ATTACHMENTS_DIR]:
-            os.makedirs(directory, exist_ok=True)
+    def _wait_for_rate_limit(self) -> None:
+        # Space request starts RATE_LIMIT_DELAY apart across all threads
+        with self._rate_limit_lock:
+            wait = self._last_request_ts + self.config.RATE_LIMIT_DELAY - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request_ts = time.monotonic()
 
     def fetch_reports(self, count: int) -> List[Dict[str, Any]]:
-        payload = {'query': self._build_query(count)}
-        response = requests.post(f'{self.config.BASE_URL}/graphql', 
-                               json=payload, 
-                               headers=self.headers)
+        # The session already sends Content-Type: application/json
+        payload = self._payload_cache.get(count)
+        if payload is None:
+            payload = self._payload_cache[count] = orjson.dumps({'query': self._build_query(count)})
+        self._wait_for_rate_limit()
+        response = self.session.post(f'{self.config.BASE_URL}/graphql', data=payload)
         response.raise_for_status()
         
-        data = response.json()['data']
+        data = orjson.loads(response.content)['data']
         return data["search"]["nodes"]
 
     def fetch_report_details(self, report_id: str) -> Optional[Dict[str, Any]]:
-        report_file = self.config.REPORTS_DIR / f"{report_id}.md"
-        if report_file.exists():
+        if report_id in self._existing_reports:
             return None
-        
+
         try:
+            self._wait_for_rate_limit()
             url = f"{self.config.BASE_URL}/reports/{report_id}.json?_={int(round(time.time() * 1000))}"
-            res = requests.get(url, headers=self.headers)
+            res = self.session.get(url)
             res.raise_for_status()
+            return orjson.loads(res.content)
             
-            time.sleep(self.config.RATE_LIMIT_DELAY)
-            return res.json()
-            
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             print(f"Error fetching report {report_id}: {e}")
             return None
 
+    def mark_report_saved(self, report_id: str) -> None:
+        self._existing_reports.add(report_id)
+
     @staticmethod
     def _build_query(count: int) -> str:
-        # Move the existing QUERY here as a class method
-        return Config.QUERY % count  # QUERY remains as is, just moved to class level
+        return f"{_QUERY_PREFIX}{count}{_QUERY_SUFFIX}"
 
 class ReportProcessor:
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, session: requests.Session):
         self.config = config
+        self.session = session
         self.reports: Dict[str, Dict[str, Any]] = {}
+        self._reports_lock = threading.Lock()
+        # One pool shared by all reports bounds attachment downloads to ATTACHMENT_WORKERS in total
+        self._attachment_executor = ThreadPoolExecutor(max_workers=self.config.ATTACHMENT_WORKERS)
+        _ensure_dirs(self.config.REPORTS_DIR, self.config.ATTACHMENTS_DIR)
+        # Resolved once so a later chdir can't split the set, downloads and cache keys
+        self._attachments_dir = self.config.ATTACHMENTS_DIR.resolve()
+        # Scan once instead of stat-ing every attachment file
+        self._existing_attachments = {p.name for p in self._attachments_dir.iterdir()}
+        # Small per-instance cache: attachments never change once saved
+        self._load_attachment = lru_cache(maxsize=32)(self._read_attachment_file)
+
+    def close(self) -> None:
+        self._attachment_executor.shutdown()
 
     def process_report(self, node: Dict[str, Any], report_data: Dict[str, Any]) -> None:
         report = {
             "id": node["_id"],
             "title": report_data["title"],
             "vulnerability_information": report_data["vulnerability_information"],
-            "summaries": " ".join(filter(None, [s.get('content') for s in report_data['summaries']])),
+            "summaries": " ".join(c for s in report_data['summaries'] if (c := s.get('content'))),
             "link": report_data["url"],
             "reporter": node["reporter"]["username"],
             "cve_ids": node["cve_ids"],
@@ -190,7 +246,8 @@ class ReportProcessor:
             "program": node["program"],
             "comments": self.format_comments(node["report"]["comments"]["nodes"])
         }
-        self.reports[node["_id"]] = report
+        with self._reports_lock:
+            self.reports[node["_id"]] = report
         return report
 
     def save_report_markdown(self, node: Dict[str, Any]) -> None:
@@ -216,11 +273,11 @@ class ReportProcessor:
         impact_summary = f"Impact Summary:\n{report_details['summaries']}"
 
         # Combine all sections
-        content = f"{metadata}\n\n{title_section}\n\n{tech_description}\n\n{impact_summary}\n\n"
+        parts = [f"{metadata}\n\n{title_section}\n\n{tech_description}\n\n{impact_summary}\n\n"]
 
         # Add formatted comments with metadata
-        comments = self.format_comments(node['report']['comments']['nodes'])
-        
+        comments = report_details['comments']
+
         for i, comment in enumerate(comments, 1):
             if 'message' in comment:
                 comment_metadata = (
@@ -230,7 +287,7 @@ class ReportProcessor:
                     f"- Comment Number: {i}\n"
                     f"- Author: {comment['author']}\n\n"
                 )
-                content += f"Comment {i}:\n{comment['message']}\n\n{comment_metadata}"
+                parts.append(f"Comment {i}:\n{comment['message']}\n\n{comment_metadata}")
 
             if 'attachments' in comment:
                 for j, attachment in enumerate(comment['attachments'], 1):
@@ -243,12 +300,24 @@ class ReportProcessor:
                             f"- Attachment Number: {j}\n"
                             f"- Author: {comment['author']}\n\n"
                         )
-                        content += f"Technical Details {i}.{j}:\n```\n{attachment['content']}\n```\n\n{attachment_metadata}"
+                        parts.append(f"Technical Details {i}.{j}:\n```\n{attachment['content']}\n```\n\n{attachment_metadata}")
 
+        # Write the sections through the buffer so small pieces are coalesced into few syscalls
         report_file = self.config.REPORTS_DIR / f"{node['_id']}.md"
-        report_file.write_text(content, encoding='utf-8')
+        with open(report_file, 'wb', buffering=self.config.WRITE_BUFFER_SIZE) as f:
+            for part in parts:
+                f.write(part.encode('utf-8'))
 
     def format_comments(self, comments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Download allowed attachments concurrently, each URL only once
+        urls = list(dict.fromkeys(
+            attachment["url"]
+            for comment in comments
+            for attachment in comment.get("attachments") or []
+            if attachment["content_type"] in self.config.ALLOWED_CONTENT_TYPES
+        ))
+        contents = dict(zip(urls, self._attachment_executor.map(self._read_attachment, urls)))
+
         formatted_comments = []
         for comment in comments:
             comment_obj = {}
@@ -262,7 +331,7 @@ class ReportProcessor:
                 for attachment in comment["attachments"]:
                     if attachment["content_type"] in self.config.ALLOWED_CONTENT_TYPES:
                         comment_obj["attachments"].append({
-                            "content": self._read_attachment(attachment["url"])
+                            "content": contents[attachment["url"]]
                         })
                     else:
                         print(f'Attachment content type not allowed: {attachment["content_type"]}')
@@ -276,46 +345,66 @@ class ReportProcessor:
     def _read_attachment(self, url: str) -> str:
         print("Reading attachment")
         filename = Path(url).name
-        file_path = self.config.ATTACHMENTS_DIR / filename
+        file_path = self._attachments_dir / filename
         
         try:
-            if file_path.exists():
-                return file_path.read_text()
-            
-            response = requests.get(url)
-            response.raise_for_status()
-            content = response.content.decode('utf-8', errors='ignore')
-            file_path.write_text(content)
-            return content
+            if filename not in self._existing_attachments:
+                self._download_attachment(url, file_path)
+                self._existing_attachments.add(filename)
+
+            return self._load_attachment(file_path)
         except (requests.RequestException, IOError) as e:
             print(f"Error processing attachment {url}: {e}")
             return f"Error reading attachment: {str(e)}"
 
+    @staticmethod
+    def _read_attachment_file(file_path: Path) -> str:
+        return file_path.read_bytes().decode('utf-8', errors='ignore')
+
+    def _download_attachment(self, url: str, file_path: Path) -> None:
+        # Stream to a temporary file so a failed download never looks cached
+        part_path = file_path.with_name(f"{file_path.name}.{threading.get_ident()}.part")
+        try:
+            with self.session.get(url, stream=True) as response:
+                response.raise_for_status()
+                with open(part_path, 'wb', buffering=self.config.WRITE_BUFFER_SIZE) as f:
+                    for chunk in response.iter_content(chunk_size=self.config.DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+            os.replace(part_path, file_path)
+        finally:
+            part_path.unlink(missing_ok=True)
+
 def main():
     # Get count from command line argument, default to 10 if not provided
     count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
     
     config = Config()
     api = HackerOneAPI(config)
-    processor = ReportProcessor(config)
+    processor = ReportProcessor(config, api.session)
     
+    def process_one(node: Dict[str, Any]) -> None:
+        print(f"Processing report {node['_id']}")
+
+        report_details = api.fetch_report_details(node['_id'])
+        if report_details:
+            processor.process_report(node, report_details)
+            processor.save_report_markdown(node)
+            api.mark_report_saved(node['_id'])
+
     try:
         # Fetch reports using provided count
         nodes = api.fetch_reports(count=count)
         
-        # Process each report
-        for node in nodes:
-            print(f"Processing report {node['_id']}")
-
-            report_details = api.fetch_report_details(node['_id'])
-            if report_details:
-                processor.process_report(node, report_details)
-                processor.save_report_markdown(node)
+        # Process reports concurrently, they are independent and I/O-bound
+        with ThreadPoolExecutor(max_workers=config.REPORT_WORKERS) as executor:
+            list(executor.map(process_one, nodes))
                 
     except ValueError:
         print("Please provide a valid number for report count")
     except Exception as e:
         print(f"Error during execution: {e}")
+    finally:
+        processor.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file